@@ -1,30 +1,162 @@
 #!/usr/bin/env python3
 """
 Convert top-down profiling CSV file to SQLite database.
-Creates tables for functions and their call relationships.
+Creates a table of functions, each row linked to its parent (caller).
 """
 
 import sys
+import csv
+import array
+import html
 import sqlite3
-import hashlib
+
+try:
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+
+
+# Number of rows read from the CSV and inserted per executemany batch
+BATCH_SIZE = 10000
+
+# Below this many rows JIT compilation costs more than it saves
+JIT_MIN_ROWS = 100000
 
 
 def count_leading_spaces(line):
     """Count the number of leading spaces in a line."""
-    count = 0
-    for char in line:
-        if char == ' ':
-            count += 1
-        else:
-            break
-    return count
+    return len(line) - len(line.lstrip(' '))
+
+
+def format_time(seconds):
+    """Format time in seconds to human-readable string (same output as the viewer)."""
+    if seconds >= 1.0:
+        return f"{seconds:.3f}s"
+    elif seconds >= 0.001:
+        return f"{seconds * 1000:.3f}ms"
+    elif seconds >= 0.000001:
+        return f"{seconds * 1000000:.3f}µs"
+    else:
+        return f"{seconds * 1000000000:.3f}ns"
 
 
-def generate_function_id(full_function, indent_level):
-    """Generate a unique ID for a function based on its signature and level."""
-    # Use hash of function name and indent to create unique ID
-    hash_obj = hashlib.md5(f"{full_function}_{indent_level}".encode())
-    return hash_obj.hexdigest()[:16]
+def parse_time(value):
+    """Parse a time column, treating unparsable values as zero."""
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def read_csv_batches(csv_file, batch_size=BATCH_SIZE):
+    """
+    Read the data rows of a top-down CSV file, batch_size rows at a time.
+    
+    Args:
+        csv_file: Path to input CSV file
+        batch_size: Maximum number of rows per batch
+    
+    Yields:
+        Lists of (line_number, function_stack, total_time, self_time, full_signature)
+        string tuples, in file order
+    """
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        # Template-heavy C++ signatures can exceed csv's default 128 KiB field limit
+        csv.field_size_limit(sys.maxsize)
+        reader = csv.reader(f, delimiter=';', quoting=csv.QUOTE_NONE)
+        
+        # Skip header lines
+        for row in reader:
+            if row and row[0] == 'Function Stack':
+                break
+        
+        batch = []
+        for row in reader:
+            # Skip empty and malformed lines
+            if len(row) < 4:
+                continue
+            
+            batch.append((reader.line_num, row[0], row[1], row[2], row[3]))
+            
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        
+        if batch:
+            yield batch
+
+
+def compute_parents(indent_levels, ids, stack_ids, stack_indents, top, jit=False):
+    """
+    Compute the parent ID of every function in a batch from its indentation.
+    
+    The parent stack carries over from one batch to the next. Indent levels strictly
+    increase up the stack, so it never holds more than (maximum indent + 1) entries.
+    
+    Args:
+        indent_levels: Indent level of each function, in file order
+        ids: ID of each function, in file order
+        stack_ids: array('q') of parent IDs on the stack, grown as needed
+        stack_indents: array('q') of the matching indent levels, grown as needed
+        top: Index of the top of the stack (-1 when empty)
+        jit: Use the compiled kernel (requires numba)
+    
+    Returns:
+        Tuple of (list of parent IDs (None for root level functions), new top index)
+    """
+    depth = max(indent_levels, default=-1) + 1
+    if len(stack_ids) < depth:
+        padding = array.array('q', [0]) * (depth - len(stack_ids))
+        stack_ids.extend(padding)
+        stack_indents.extend(padding)
+    
+    if jit:
+        parent_ids, top = _compute_parents_jit(np.asarray(indent_levels, dtype=np.int64),
+                                               np.asarray(ids, dtype=np.int64),
+                                               np.frombuffer(stack_ids, dtype=np.int64),
+                                               np.frombuffer(stack_indents, dtype=np.int64),
+                                               top)
+        return [parent_id or None for parent_id in parent_ids.tolist()], top
+    
+    parent_ids = []
+    
+    for func_id, indent_level in zip(ids, indent_levels):
+        # Remove parents at same or higher indent level
+        while top >= 0 and stack_indents[top] >= indent_level:
+            top -= 1
+        
+        parent_ids.append(stack_ids[top] if top >= 0 else None)
+        
+        # Add current function to parent stack
+        top += 1
+        stack_ids[top] = func_id
+        stack_indents[top] = indent_level
+    
+    return parent_ids, top
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _compute_parents_jit(indent_levels, ids, stack_ids, stack_indents, top):
+        """Compiled compute_parents over int64 arrays; 0 marks a root (IDs are never 0)."""
+        n = indent_levels.shape[0]
+        parent_ids = np.zeros(n, dtype=np.int64)
+        
+        for i in range(n):
+            # Remove parents at same or higher indent level
+            while top >= 0 and stack_indents[top] >= indent_levels[i]:
+                top -= 1
+            
+            if top >= 0:
+                parent_ids[i] = stack_ids[top]
+            
+            # Add current function to parent stack
+            top += 1
+            stack_ids[top] = ids[i]
+            stack_indents[top] = indent_levels[i]
+        
+        return parent_ids, top
 
 
 def parse_csv_to_database(csv_file, db_file):
@@ -35,14 +167,34 @@ def parse_csv_to_database(csv_file, db_file):
         csv_file: Path to input CSV file
         db_file: Path to output SQLite database
     """
-    # Connect to SQLite database (creates if doesn't exist)
-    conn = sqlite3.connect(db_file)
-    cursor = conn.cursor()
+    # Connect to SQLite database (creates if doesn't exist); transactions are
+    # managed explicitly with BEGIN/COMMIT rather than by the sqlite3 module
+    conn = sqlite3.connect(db_file, isolation_level=None, cached_statements=256)
+    
+    # Bulk-load tuning: the database is rebuilt from the CSV on failure,
+    # so durability guarantees can be relaxed during ingest
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=OFF')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-200000')
+    
+    # Rebuild from scratch: drop any tables left by a previous run, including ones
+    # from older schemas (call_relationships, function_children_cache)
+    conn.execute('BEGIN')
+    try:
+        conn.execute('DROP TABLE IF EXISTS functions_fts')
+    except sqlite3.OperationalError:
+        # Without FTS5 an old search index cannot be dropped; the search index step reports it
+        pass
+    conn.execute('DROP TABLE IF EXISTS function_children_cache')
+    conn.execute('DROP TABLE IF EXISTS call_relationships')
+    conn.execute('DROP TABLE IF EXISTS functions')
+    conn.execute('COMMIT')
     
     # Create tables
-    cursor.execute('''
+    conn.execute('''
         CREATE TABLE IF NOT EXISTS functions (
-            id TEXT PRIMARY KEY,
+            id INTEGER PRIMARY KEY,
             function_stack TEXT NOT NULL,
             short_name TEXT NOT NULL,
             full_signature TEXT NOT NULL,
@@ -50,213 +202,134 @@ def parse_csv_to_database(csv_file, db_file):
             self_time REAL NOT NULL,
             percentage REAL NOT NULL,
             indent_level INTEGER NOT NULL,
-            line_number INTEGER NOT NULL
+            line_number INTEGER NOT NULL,
+            short_name_html TEXT NOT NULL,
+            full_signature_html TEXT NOT NULL,
+            total_time_fmt TEXT NOT NULL,
+            self_time_fmt TEXT NOT NULL,
+            percentage_fmt TEXT NOT NULL,
+            parent_id INTEGER REFERENCES functions(id)
         )
     ''')
     
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS call_relationships (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            parent_id TEXT,
-            child_id TEXT NOT NULL,
-            FOREIGN KEY (parent_id) REFERENCES functions(id),
-            FOREIGN KEY (child_id) REFERENCES functions(id)
-        )
-    ''')
+    # Parse the CSV in a single pass; the first data line (Total) gives the total CPU time
+    total_cpu_time = None
+    rows_loaded = 0
     
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_parent ON call_relationships(parent_id)
-    ''')
+    # Stack of parent functions kept as parallel ID/indent arrays plus a top index
+    stack_ids = array.array('q')
+    stack_indents = array.array('q')
+    top = -1
+    
+    # Insert everything in a single transaction, one executemany per batch
+    conn.execute('BEGIN')
+    
+    for rows in read_csv_batches(csv_file):
+        line_numbers, function_stacks, total_time_strs, self_time_strs, full_signatures = map(list, zip(*rows))
+        
+        # Extract short names from function stacks (trim all leading/trailing spaces)
+        short_names = [function_stack.strip() for function_stack in function_stacks]
+        full_signatures = [full_signature.strip() for full_signature in full_signatures]
+        indent_levels = list(map(count_leading_spaces, function_stacks))
+        total_times = list(map(parse_time, total_time_strs))
+        self_times = list(map(parse_time, self_time_strs))
+        
+        if total_cpu_time is None:
+            total_cpu_time = total_times[0] or 1.0  # Avoid division by zero
+        
+        if total_cpu_time > 0:
+            percentages = [total_time / total_cpu_time * 100.0 for total_time in total_times]
+        else:
+            percentages = [0.0] * len(total_times)
+        
+        # Pre-render the display strings once so the viewer does not redo it per request
+        short_names_html = list(map(html.escape, short_names))
+        full_signatures_html = list(map(html.escape, full_signatures))
+        total_times_fmt = list(map(format_time, total_times))
+        self_times_fmt = list(map(format_time, self_times))
+        percentages_fmt = [f"{percentage:.2f}%" for percentage in percentages]
+        
+        # The CSV line number is unique and doubles as the row ID; root level functions have no parent.
+        # Only switch to the compiled kernel once the file has proved large enough to repay compilation
+        parent_ids, top = compute_parents(indent_levels, line_numbers, stack_ids, stack_indents, top,
+                                          jit=numba is not None and rows_loaded >= JIT_MIN_ROWS)
+        
+        conn.executemany('''
+            INSERT INTO functions 
+            (id, function_stack, short_name, full_signature, total_time, self_time, percentage, indent_level, line_number,
+             short_name_html, full_signature_html, total_time_fmt, self_time_fmt, percentage_fmt, parent_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', zip(line_numbers, function_stacks, short_names, full_signatures, total_times,
+                 self_times, percentages, indent_levels, line_numbers,
+                 short_names_html, full_signatures_html, total_times_fmt, self_times_fmt, percentages_fmt,
+                 parent_ids))
+        
+        rows_loaded += len(rows)
+    
+    if total_cpu_time is None:
+        total_cpu_time = 1.0
+    
+    # Commit bulk load
+    conn.execute('COMMIT')
     
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_child ON call_relationships(child_id)
+    # Create indexes once the bulk load is done rather than maintaining them per row
+    conn.execute('BEGIN')
+    
+    # Matches the children lookup, so it is served without a sort
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_functions_parent ON functions(parent_id, total_time DESC)
     ''')
     
-    cursor.execute('''
+    conn.execute('''
         CREATE INDEX IF NOT EXISTS idx_indent ON functions(indent_level)
     ''')
     
-    cursor.execute('''
+    conn.execute('''
         CREATE INDEX IF NOT EXISTS idx_percentage ON functions(percentage)
     ''')
     
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_total_time ON functions(total_time)
+    # Match the viewer's paginated sort orders; each index covers the (sort key, id)
+    # scan that picks a page, so only the page's own rows are read from the table
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_total_time ON functions(total_time DESC, id)
     ''')
     
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_self_time ON functions(self_time)
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_self_time ON functions(self_time DESC, id)
     ''')
     
-    cursor.execute('''
+    conn.execute('''
         CREATE INDEX IF NOT EXISTS idx_short_name ON functions(short_name)
     ''')
     
-    # Cache table for function children (denormalized for faster lookups)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS function_children_cache (
-            parent_id TEXT NOT NULL,
-            child_id TEXT NOT NULL,
-            child_short_name TEXT NOT NULL,
-            child_full_signature TEXT NOT NULL,
-            child_total_time REAL NOT NULL,
-            child_self_time REAL NOT NULL,
-            child_percentage REAL NOT NULL,
-            child_indent_level INTEGER NOT NULL,
-            PRIMARY KEY (parent_id, child_id)
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_fcc_parent ON function_children_cache(parent_id)
-    ''')
-    
-    # First pass: get total CPU time from first data line
-    total_cpu_time = 0.0
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        # Skip header lines
-        for line in f:
-            if line.startswith('Function Stack;'):
-                break
-        
-        # Read first data line (Total)
-        for line in f:
-            if line.strip():
-                parts = line.split(';')
-                if len(parts) >= 2:
-                    try:
-                        total_cpu_time = float(parts[1])
-                    except ValueError:
-                        total_cpu_time = 1.0  # Avoid division by zero
-                break
-    
-    if total_cpu_time == 0.0:
-        total_cpu_time = 1.0  # Avoid division by zero
+    conn.execute('COMMIT')
     
-    # Parse CSV file
-    parent_stack = []  # Stack to track parent functions at each level
-    line_number = 0
-    
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        # Skip header lines
-        for line in f:
-            line_number += 1
-            if line.startswith('Function Stack;'):
-                break
-        
-        # Process data lines
-        for line in f:
-            line_number += 1
-            
-            # Skip empty lines
-            if not line.strip():
-                continue
-            
-            # Parse the line
-            parts = line.split(';')
-            if len(parts) < 4:
-                continue
-            
-            function_stack = parts[0]
-            total_time_str = parts[1]
-            self_time_str = parts[2]
-            full_signature = parts[3].strip()
-            
-            # Extract short name from function stack (trim all leading/trailing spaces)
-            short_name = function_stack.strip()
-            
-            # Count indent level
-            indent_level = count_leading_spaces(function_stack)
-            
-            # Parse times
-            try:
-                total_time = float(total_time_str)
-            except ValueError:
-                total_time = 0.0
-            
-            try:
-                self_time = float(self_time_str)
-            except ValueError:
-                self_time = 0.0
-            
-            # Generate unique ID
-            func_id = generate_function_id(full_signature, line_number)
-            
-            # Calculate percentage
-            percentage = (total_time / total_cpu_time * 100.0) if total_cpu_time > 0 else 0.0
-            
-            # Insert function into database
-            cursor.execute('''
-                INSERT OR REPLACE INTO functions 
-                (id, function_stack, short_name, full_signature, total_time, self_time, percentage, indent_level, line_number)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (func_id, function_stack, short_name, full_signature, total_time, self_time, percentage, indent_level, line_number))
-            
-            # Update parent stack
-            # Remove parents at same or higher indent level
-            while parent_stack and parent_stack[-1][1] >= indent_level:
-                parent_stack.pop()
-            
-            # Add relationship to parent if exists
-            if parent_stack:
-                parent_id = parent_stack[-1][0]
-                cursor.execute('''
-                    INSERT INTO call_relationships (parent_id, child_id)
-                    VALUES (?, ?)
-                ''', (parent_id, func_id))
-            else:
-                # Root level function - no parent
-                cursor.execute('''
-                    INSERT INTO call_relationships (parent_id, child_id)
-                    VALUES (?, ?)
-                ''', (None, func_id))
-            
-            # Add current function to parent stack
-            parent_stack.append((func_id, indent_level))
-    
-    # Commit and close
-    conn.commit()
-    
-    # Build cache tables
-    print("Building cache tables...")
-    
-    # Populate function_children_cache
-    cursor.execute('''
-        INSERT INTO function_children_cache 
-        (parent_id, child_id, child_short_name, child_full_signature, 
-         child_total_time, child_self_time, child_percentage, child_indent_level)
-        SELECT 
-            cr.parent_id,
-            f.id,
-            f.short_name,
-            f.full_signature,
-            f.total_time,
-            f.self_time,
-            f.percentage,
-            f.indent_level
-        FROM functions f
-        JOIN call_relationships cr ON f.id = cr.child_id
-        WHERE cr.parent_id IS NOT NULL
-        ORDER BY cr.parent_id, f.total_time DESC
-    ''')
-    
-    conn.commit()
+    # Full-text index over function names for the viewer's search box
+    try:
+        conn.execute('BEGIN')
+        conn.execute('''
+            CREATE VIRTUAL TABLE functions_fts USING fts5(
+                short_name, full_signature, content='functions', content_rowid='id'
+            )
+        ''')
+        conn.execute("INSERT INTO functions_fts(functions_fts) VALUES ('rebuild')")
+        conn.execute('COMMIT')
+    except sqlite3.OperationalError as e:
+        conn.execute('ROLLBACK')
+        print(f"  Skipping search index ({e})")
     
     # Print statistics
-    cursor.execute('SELECT COUNT(*) FROM functions')
-    func_count = cursor.fetchone()[0]
-    
-    cursor.execute('SELECT COUNT(*) FROM call_relationships')
-    rel_count = cursor.fetchone()[0]
+    func_count = conn.execute('SELECT COUNT(*) FROM functions').fetchone()[0]
     
-    cursor.execute('SELECT COUNT(*) FROM function_children_cache')
-    cache_count = cursor.fetchone()[0]
+    rel_count = conn.execute('SELECT COUNT(parent_id) FROM functions').fetchone()[0]
     
     print(f"Database created: {db_file}")
     print(f"  Total CPU time: {total_cpu_time}")
     print(f"  Functions: {func_count}")
     print(f"  Relationships: {rel_count}")
-    print(f"  Cached children: {cache_count}")
+    
+    # WAL mode is persistent; switch back so readers don't need to create -wal/-shm files
+    conn.execute('PRAGMA journal_mode=DELETE')
     
     conn.close()
 
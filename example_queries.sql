@@ -17,8 +17,7 @@ LIMIT 20;
 -- 3. Get immediate children of a specific function (e.g., doEvent)
 SELECT f.short_name, f.total_time, f.self_time, f.full_signature
 FROM functions f 
-JOIN call_relationships cr ON f.id = cr.child_id 
-JOIN functions p ON cr.parent_id = p.id 
+JOIN functions p ON f.parent_id = p.id 
 WHERE p.short_name LIKE '%EDProducerAdaptorBase::doEvent%' 
 ORDER BY f.total_time DESC;
 
@@ -33,17 +32,15 @@ ORDER BY indent_level;
 -- 5. Find all callers of a specific function
 SELECT p.short_name as parent, p.total_time as parent_total_time,
        c.short_name as child, c.total_time as child_total_time
-FROM call_relationships cr
-JOIN functions p ON cr.parent_id = p.id
-JOIN functions c ON cr.child_id = c.id
+FROM functions c
+JOIN functions p ON c.parent_id = p.id
 WHERE c.short_name LIKE '%malloc%'
 LIMIT 50;
 
 -- 6. Get root level functions (no parent)
 SELECT f.short_name, f.total_time, f.self_time
 FROM functions f
-JOIN call_relationships cr ON f.id = cr.child_id
-WHERE cr.parent_id IS NULL
+WHERE f.parent_id IS NULL
 ORDER BY f.total_time DESC;
 
 -- 7. Find functions with highest self time percentage
@@ -109,11 +106,18 @@ WITH RECURSIVE call_chain(id, name, total_time, level, path) AS (
     SELECT f.id, f.short_name, f.total_time, cc.level + 1, 
            cc.path || ' -> ' || f.short_name
     FROM call_chain cc
-    JOIN call_relationships cr ON cc.id = cr.parent_id
-    JOIN functions f ON cr.child_id = f.id
+    JOIN functions f ON f.parent_id = cc.id
     WHERE cc.level < 20  -- Limit recursion depth
 )
 SELECT level, name, total_time, path
 FROM call_chain
 WHERE name LIKE '%produce%'
 LIMIT 20;
+
+-- 13. Full-text search on function names (prefix match, hottest first)
+SELECT f.short_name, f.total_time, f.self_time
+FROM functions_fts
+JOIN functions f ON f.id = functions_fts.rowid
+WHERE functions_fts MATCH '"EDProducer"*'
+ORDER BY f.total_time DESC
+LIMIT 20;
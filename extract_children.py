@@ -4,19 +4,10 @@ Extract immediate children of edm::stream::EDProducerAdaptorBase::doEvent
 from a top-down profiling CSV file.
 """
 
+import os
 import sys
 import csv
-
-
-def count_leading_spaces(line):
-    """Count the number of leading spaces in a line."""
-    count = 0
-    for char in line:
-        if char == ' ':
-            count += 1
-        else:
-            break
-    return count
+import mmap
 
 
 def get_total_cpu_time(filename):
@@ -29,21 +20,23 @@ def get_total_cpu_time(filename):
     Returns:
         float: Total CPU time
     """
-    with open(filename, 'r', encoding='utf-8') as f:
+    with open(filename, 'r', encoding='utf-8', newline='') as f:
+        # Template-heavy C++ signatures can exceed csv's default 128 KiB field limit
+        csv.field_size_limit(sys.maxsize)
+        reader = csv.reader(f, delimiter=';', quoting=csv.QUOTE_NONE)
+        
         # Skip the header lines
-        for line in f:
-            if line.startswith('Function Stack;'):
+        for row in reader:
+            if row and row[0] == 'Function Stack':
                 break
         
         # Read the first data line (Total)
-        for line in f:
-            if line.strip():
-                parts = line.split(';')
-                if len(parts) >= 2:
-                    try:
-                        return float(parts[1])
-                    except ValueError:
-                        return 0.0
+        for row in reader:
+            if len(row) >= 2:
+                try:
+                    return float(row[1])
+                except ValueError:
+                    return 0.0
     return 0.0
 
 
@@ -71,66 +64,90 @@ def extract_immediate_children(filename, parent_function):
         Tuple[List[Tuple[str, str]], Optional[float]]: (children, parent_total_time)
     """
     children = []
-    parent_indent = None
-    found_parent = False
     parent_total_time = None
     unknown_block_active = False
     
-    with open(filename, 'r', encoding='utf-8') as f:
-        # Skip the header lines
-        for line in f:
-            if line.startswith('Function Stack;'):
-                break
+    header = b'Function Stack;'
+    parent = parent_function.encode('utf-8')
+    
+    with open(filename, 'rb') as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return children, parent_total_time
         
-        # Process the data lines
-        for line in f:
-            # Skip empty lines
-            if not line.strip():
-                continue
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
             
-            # Parse the line
-            parts = line.split(';')
-            if len(parts) < 4:
-                continue
-            
-            function_stack = parts[0]
-            total_time = parts[1]
-            # self_time = parts[2]
-            full_function = parts[3].strip()
+            # Skip the header lines
+            if mm[:len(header)] == header:
+                pos = 0
+            else:
+                pos = mm.find(b'\n' + header) + 1
+                if pos == 0:
+                    return children, parent_total_time
+            pos = mm.find(b'\n', pos) + 1
+            if pos == 0:
+                return children, parent_total_time
             
-            # Count leading spaces
-            indent = count_leading_spaces(function_stack)
+            # Jump straight to the first line whose function stack contains the parent
+            while True:
+                hit = mm.find(parent, pos)
+                if hit < 0:
+                    return children, parent_total_time
+                
+                start = mm.rfind(b'\n', pos, hit) + 1 or pos
+                end = mm.find(b'\n', hit)
+                if end < 0:
+                    end = size
+                pos = end + 1
+                
+                parts = mm[start:end].split(b';', 4)
+                if len(parts) >= 4 and parent in parts[0]:
+                    break
             
-            # Check if this is the parent function we're looking for
-            if parent_function in function_stack and not found_parent:
-                parent_indent = indent
-                found_parent = True
-                try:
-                    parent_total_time = float(total_time)
-                except ValueError:
-                    parent_total_time = None
-                continue
+            function_stack = parts[0]
+            parent_indent = len(function_stack) - len(function_stack.lstrip(b' '))
+            try:
+                parent_total_time = float(parts[1])
+            except ValueError:
+                parent_total_time = None
             
-            # If we found the parent, look for immediate children
-            if found_parent and parent_indent is not None:
+            # Process the lines following the parent, looking for immediate children
+            while pos < size:
+                end = mm.find(b'\n', pos)
+                if end < 0:
+                    end = size
+                parts = mm[pos:end].split(b';', 4)
+                pos = end + 1
+                
+                # Skip empty and malformed lines
+                if len(parts) < 4:
+                    continue
+                
+                function_stack, total_time, _self_time, full_function = parts[:4]
+                full_function = full_function.strip()
+                
+                # Count leading spaces
+                indent = len(function_stack) - len(function_stack.lstrip(b' '))
+                
                 # Immediate children have exactly one more level of indentation
                 if indent == parent_indent + 1:
                     # If this child is the Unknown placeholder, don't add it;
                     # instead, activate a block to collect its immediate children.
-                    if full_function.strip() == "[Unknown stack frame(s)]":
+                    if full_function == b"[Unknown stack frame(s)]":
                         unknown_block_active = True
                     else:
-                        children.append((full_function, total_time))
+                        children.append((full_function.decode('utf-8'), total_time.decode('utf-8')))
                         unknown_block_active = False
                 # If we're inside an Unknown block, collect its immediate children
                 elif indent == parent_indent + 2 and unknown_block_active:
-                    children.append((full_function, total_time))
+                    children.append((full_function.decode('utf-8'), total_time.decode('utf-8')))
                 # If we encounter a function at the same or lower level as the parent, we're done
                 elif indent <= parent_indent:
                     break
                 # If we encounter another sibling at the child level, toggle Unknown block appropriately
                 elif indent == parent_indent + 1:
-                    unknown_block_active = (full_function.strip() == "[Unknown stack frame(s)]")
+                    unknown_block_active = (full_function == b"[Unknown stack frame(s)]")
                 # For deeper levels beyond immediate children of Unknown, ignore
     
     return children, parent_total_time
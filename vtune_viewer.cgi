@@ -25,6 +25,9 @@ cgitb.enable()
 # Default database file - adjust this path as needed
 DEFAULT_DB = "step3-29834.21.top-down.db"
 
+# Number of functions shown per page of the function list
+PAGE_SIZE = 200
+
 def get_db_path():
     """Get the database path from PATH_INFO, query string, or use default."""
     # Try to get from PATH_INFO first (e.g., /vtune_viewer.cgi/path/to/db.db)
@@ -241,33 +244,61 @@ def html_footer():
 """
 
 
-def show_function_list(conn, db_path, sort_by='total'):
-    """Display list of all functions with sorting."""
+def print_pagination_links(db_file, sort_by, page, page_count):
+    """Print previous/next page links for the function list."""
+    print('<div class="sort-controls">')
+    
+    if page > 0:
+        params = {'db': db_file, 'sort': sort_by, 'page': page - 1}
+        print(f'<a href="?{urlencode(params)}" class="sort-button">← Previous</a>')
+    
+    print(f'<strong>Page {page + 1} of {page_count}</strong> ')
+    
+    if page + 1 < page_count:
+        params = {'db': db_file, 'sort': sort_by, 'page': page + 1}
+        print(f'<a href="?{urlencode(params)}" class="sort-button">Next →</a>')
+    
+    print('</div>')
+
+
+def show_function_list(conn, db_path, sort_by='total', page=0):
+    """Display one page of the function list with sorting."""
     db_file = os.path.basename(db_path)
     
-    # Determine sort order
-    order_by = "total_time DESC"
+    # Determine sort order (ties broken by id so pages are stable)
+    order_by = "total_time DESC, id"
     sort_title = "Total Time"
     
     if sort_by == 'self':
-        order_by = "self_time DESC"
+        order_by = "self_time DESC, id"
         sort_title = "Self Time"
     elif sort_by == 'name':
-        order_by = "short_name ASC"
+        order_by = "short_name ASC, id"
         sort_title = "Function Name"
     
     cursor = conn.cursor()
+    cursor.execute('SELECT COUNT(*) FROM functions')
+    function_count = cursor.fetchone()[0]
+    page_count = max(1, -(-function_count // PAGE_SIZE))
+    page = min(page, page_count - 1)
+    
+    # Pick the page's IDs from the covering sort index, then read just those rows
     cursor.execute(f'''
-        SELECT id, short_name, full_signature, total_time, self_time, percentage, indent_level
-        FROM functions
-        ORDER BY {order_by} 
-    ''')
+        SELECT id, short_name_html, full_signature_html, total_time_fmt, self_time_fmt, percentage_fmt, indent_level
+        FROM (
+            SELECT id FROM functions
+            ORDER BY {order_by}
+            LIMIT ? OFFSET ?
+        ) AS page
+        JOIN functions USING (id)
+        ORDER BY {order_by}
+    ''', (PAGE_SIZE, page * PAGE_SIZE))
     
     functions = cursor.fetchall()
     
     print(html_header("VTune Profiling Data"))
     print(f"<h1>VTune Top-Down Profiling Data</h1>")
-    print(f'<p class="info">Database: {html.escape(db_file)} | Total functions: {len(functions)} | Sorted by: {sort_title}</p>')
+    print(f'<p class="info">Database: {html.escape(db_file)} | Total functions: {function_count} | Sorted by: {sort_title}</p>')
     
     # Sort controls
     print('<div class="sort-controls">')
@@ -287,6 +318,8 @@ def show_function_list(conn, db_path, sort_by='total'):
     
     print('</div>')
     
+    print_pagination_links(db_file, sort_by, page, page_count)
+    
     # Function table
     print('<table>')
     print('<thead>')
@@ -302,22 +335,23 @@ def show_function_list(conn, db_path, sort_by='total'):
     print('<tbody>')
     
     for func in functions:
-        func_id, short_name, full_signature, total_time, self_time, percentage, indent_level = func
+        func_id, short_name_html, full_signature_html, total_time_fmt, self_time_fmt, percentage_fmt, indent_level = func
         
         params = {'db': db_file, 'view': 'function', 'id': func_id, 'sort': sort_by}
         link = f"?{urlencode(params)}"
         
         print('<tr>')
-        print(f'<td><a href="{html.escape(link)}" class="function-link">{html.escape(short_name)}</a></td>')
-        print(f'<td class="time-cell">{format_time(total_time)}</td>')
-        print(f'<td class="time-cell">{format_time(self_time)}</td>')
-        print(f'<td class="percentage-cell">{percentage:.2f}%</td>')
+        print(f'<td><a href="{html.escape(link)}" class="function-link">{short_name_html}</a></td>')
+        print(f'<td class="time-cell">{total_time_fmt}</td>')
+        print(f'<td class="time-cell">{self_time_fmt}</td>')
+        print(f'<td class="percentage-cell">{percentage_fmt}</td>')
         print(f'<td>{indent_level}</td>')
-        print(f'<td class="signature-cell">{html.escape(full_signature)}</td>')
+        print(f'<td class="signature-cell">{full_signature_html}</td>')
         print('</tr>')
     
     print('</tbody>')
     print('</table>')
+    print_pagination_links(db_file, sort_by, page, page_count)
     print(html_footer())
 
 
@@ -327,12 +361,17 @@ def show_function_details(conn, func_id, db_path, sort_by='total'):
     
     cursor = conn.cursor()
     
-    # Get function details
+    # Get function details (IDs are integer CSV line numbers; anything outside
+    # SQLite's integer range cannot match and would not bind)
+    row_id = int(func_id) if func_id.isdecimal() else None
+    if row_id is not None and row_id >= 2**63:
+        row_id = None
+    
     cursor.execute('''
         SELECT id, short_name, full_signature, total_time, self_time, percentage, indent_level
         FROM functions
         WHERE id = ?
-    ''', (func_id,))
+    ''', (row_id,))
     
     func = cursor.fetchone()
     if not func:
@@ -346,13 +385,13 @@ def show_function_details(conn, func_id, db_path, sort_by='total'):
     
     func_id, short_name, full_signature, total_time, self_time, percentage, indent_level = func
     
-    # Get children - use cache table for faster lookups
+    # Get children (indexed on parent_id, total_time)
     cursor.execute('''
-        SELECT child_id, child_short_name, child_full_signature, 
-               child_total_time, child_self_time, child_percentage, child_indent_level
-        FROM function_children_cache
+        SELECT id, short_name_html, full_signature_html, 
+               total_time_fmt, self_time_fmt, percentage_fmt, indent_level
+        FROM functions
         WHERE parent_id = ?
-        ORDER BY child_total_time DESC
+        ORDER BY total_time DESC
     ''', (func_id,))
     
     children = cursor.fetchall()
@@ -391,18 +430,18 @@ def show_function_details(conn, func_id, db_path, sort_by='total'):
         print('<tbody>')
         
         for child in children:
-            child_id, child_short_name, child_full_signature, child_total_time, child_self_time, child_percentage, child_indent_level = child
+            child_id, child_short_name_html, child_full_signature_html, child_total_time_fmt, child_self_time_fmt, child_percentage_fmt, child_indent_level = child
             
             params = {'db': db_file, 'view': 'function', 'id': child_id, 'sort': sort_by}
             link = f"?{urlencode(params)}"
             
             print('<tr>')
-            print(f'<td><a href="{html.escape(link)}" class="function-link">{html.escape(child_short_name)}</a></td>')
-            print(f'<td class="time-cell">{format_time(child_total_time)}</td>')
-            print(f'<td class="time-cell">{format_time(child_self_time)}</td>')
-            print(f'<td class="percentage-cell">{child_percentage:.2f}%</td>')
+            print(f'<td><a href="{html.escape(link)}" class="function-link">{child_short_name_html}</a></td>')
+            print(f'<td class="time-cell">{child_total_time_fmt}</td>')
+            print(f'<td class="time-cell">{child_self_time_fmt}</td>')
+            print(f'<td class="percentage-cell">{child_percentage_fmt}</td>')
             print(f'<td>{child_indent_level}</td>')
-            print(f'<td class="signature-cell">{html.escape(child_full_signature)}</td>')
+            print(f'<td class="signature-cell">{child_full_signature_html}</td>')
             print('</tr>')
         
         print('</tbody>')
@@ -432,6 +471,8 @@ def main():
         view = form.getfirst('view', 'list')
         func_id = form.getfirst('id', '')
         sort_by = form.getfirst('sort', 'total')
+        page = form.getfirst('page', '0')
+        page = int(page) if page.isdecimal() else 0
         
         # Connect to database
         conn = sqlite3.connect(db_path)
@@ -440,7 +481,7 @@ def main():
         if view == 'function' and func_id:
             show_function_details(conn, func_id, db_path, sort_by)
         else:
-            show_function_list(conn, db_path, sort_by)
+            show_function_list(conn, db_path, sort_by, page)
         
         conn.close()
         
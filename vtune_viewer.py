@@ -13,20 +13,55 @@ Example:
 import sqlite3
 import os
 import sys
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import queue
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs, urlencode
 import html
+from functools import lru_cache
 
 # Default database file
 DEFAULT_DB = "step3-29834.21.top-down.db"
 DEFAULT_PORT = 8080
 
-# Global variable for database path
+# Number of rows fetched from SQLite at a time while streaming tables
+FETCH_SIZE = 1000
+
+# Approximate size in bytes of each chunk of a streamed response
+CHUNK_SIZE = 64 * 1024
+
+# Number of functions shown per page of the function list
+PAGE_SIZE = 200
+
+# One function table row, filled with % from (id, sort query, name, total time,
+# self time, percentage, indent level, signature); strings are pre-rendered at load time
+ROW_TEMPLATE = (
+    '<tr>'
+    '<td><a href="/?view=function&amp;id=%d&amp;%s" class="function-link">%s</a></td>'
+    '<td class="time-cell">%s</td>'
+    '<td class="time-cell">%s</td>'
+    '<td class="percentage-cell">%s</td>'
+    '<td>%d</td>'
+    '<td class="signature-cell">%s</td>'
+    '</tr>'
+)
+
+# Global variables for database path and the pool of idle connections
 DB_PATH = None
+CONNECTION_POOL = queue.SimpleQueue()
 
 
+def open_connection():
+    """Open a read-only connection to the database."""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.execute('PRAGMA mmap_size=1073741824')
+    conn.execute('PRAGMA query_only=ON')
+    return conn
+
+
+@lru_cache(maxsize=8192)
 def format_time(seconds):
-    """Format time in seconds to human-readable string."""
+    """Format time in seconds to human-readable string (memoized, values repeat a lot)."""
     if seconds >= 1.0:
         return f"{seconds:.3f}s"
     elif seconds >= 0.001:
@@ -194,6 +229,11 @@ def html_header(title):
             background-color: #005a9e;
             font-weight: bold;
         }}
+        .search-input {{
+            padding: 6px;
+            width: 400px;
+            margin-right: 10px;
+        }}
         .info {{
             color: #666;
             font-size: 14px;
@@ -223,187 +263,354 @@ def html_footer():
 """
 
 
-def show_function_list(conn, sort_by='total'):
-    """Display list of all functions with sorting."""
-    # Determine sort order
-    order_by = "total_time DESC"
+def pagination_links(sort_by, page, page_count):
+    """Generate previous/next page links for the function list."""
+    links = ['<div class="sort-controls">']
+    
+    if page > 0:
+        params = {'sort': sort_by, 'page': page - 1}
+        links.append(f'<a href="/?{urlencode(params)}" class="sort-button">← Previous</a>')
+    
+    links.append(f'<strong>Page {page + 1} of {page_count}</strong> ')
+    
+    if page + 1 < page_count:
+        params = {'sort': sort_by, 'page': page + 1}
+        links.append(f'<a href="/?{urlencode(params)}" class="sort-button">Next →</a>')
+    
+    links.append('</div>')
+    return '\n'.join(links)
+
+
+def search_form(query, sort_by):
+    """Generate the function search box."""
+    return f'''<form action="/" method="get" class="sort-controls">
+<strong>Search:</strong>
+<input type="text" name="q" value="{html.escape(query)}" class="search-input" placeholder="Function name or signature">
+<input type="hidden" name="sort" value="{html.escape(sort_by)}">
+<button type="submit" class="sort-button">Search</button>
+</form>'''
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query matching every word as a prefix."""
+    # Control characters (e.g. NUL) end an FTS5 string early, so drop them
+    text = ''.join(ch for ch in text if ch.isprintable() or ch.isspace())
+    return ' '.join('"%s"*' % term.replace('"', '""') for term in text.split())
+
+
+def show_function_list(conn, sort_by, page):
+    """Yield one page of the function list with sorting, one HTML fragment at a time."""
+    # Determine sort order (ties broken by id so pages are stable)
+    order_by = "total_time DESC, id"
     sort_title = "Total Time"
     
     if sort_by == 'self':
-        order_by = "self_time DESC"
+        order_by = "self_time DESC, id"
         sort_title = "Self Time"
     elif sort_by == 'name':
-        order_by = "short_name ASC"
+        order_by = "short_name ASC, id"
         sort_title = "Function Name"
     
     cursor = conn.cursor()
-    cursor.execute(f'''
-        SELECT id, short_name, full_signature, total_time, self_time, percentage, indent_level
-        FROM functions
-        ORDER BY {order_by}
-    ''')
+    cursor.execute('SELECT COUNT(*) FROM functions')
+    function_count = cursor.fetchone()[0]
+    page_count = max(1, -(-function_count // PAGE_SIZE))
+    page = min(page, page_count - 1)
     
-    functions = cursor.fetchall()
-    
-    output = []
-    output.append(html_header("VTune Profiling Data"))
-    output.append(f"<h1>VTune Top-Down Profiling Data</h1>")
-    output.append(f'<p class="info">Database: {html.escape(os.path.basename(DB_PATH))} | Total functions: {len(functions)} | Sorted by: {sort_title}</p>')
+    yield html_header("VTune Profiling Data")
+    yield f"<h1>VTune Top-Down Profiling Data</h1>"
+    yield f'<p class="info">Database: {html.escape(os.path.basename(DB_PATH))} | Total functions: {function_count} | Sorted by: {sort_title}</p>'
     
     # Sort controls
-    output.append('<div class="sort-controls">')
-    output.append('<strong>Sort by:</strong> ')
+    yield '<div class="sort-controls">'
+    yield '<strong>Sort by:</strong> '
     
     params = {'sort': 'total'}
     active_class = ' active' if sort_by == 'total' else ''
-    output.append(f'<a href="/?{urlencode(params)}" class="sort-button{active_class}">Total Time</a>')
+    yield f'<a href="/?{urlencode(params)}" class="sort-button{active_class}">Total Time</a>'
     
     params['sort'] = 'self'
     active_class = ' active' if sort_by == 'self' else ''
-    output.append(f'<a href="/?{urlencode(params)}" class="sort-button{active_class}">Self Time</a>')
+    yield f'<a href="/?{urlencode(params)}" class="sort-button{active_class}">Self Time</a>'
     
     params['sort'] = 'name'
     active_class = ' active' if sort_by == 'name' else ''
-    output.append(f'<a href="/?{urlencode(params)}" class="sort-button{active_class}">Function Name</a>')
+    yield f'<a href="/?{urlencode(params)}" class="sort-button{active_class}">Function Name</a>'
+    
+    yield '</div>'
     
-    output.append('</div>')
+    yield search_form('', sort_by)
+    
+    yield pagination_links(sort_by, page, page_count)
     
     # Function table
-    output.append('<table>')
-    output.append('<thead>')
-    output.append('<tr>')
-    output.append('<th>Function</th>')
-    output.append('<th class="time-cell">Total Time</th>')
-    output.append('<th class="time-cell">Self Time</th>')
-    output.append('<th class="percentage-cell">% of Total</th>')
-    output.append('<th>Indent Level</th>')
-    output.append('<th>Full Signature</th>')
-    output.append('</tr>')
-    output.append('</thead>')
-    output.append('<tbody>')
+    yield '<table>'
+    yield '<thead>'
+    yield '<tr>'
+    yield '<th>Function</th>'
+    yield '<th class="time-cell">Total Time</th>'
+    yield '<th class="time-cell">Self Time</th>'
+    yield '<th class="percentage-cell">% of Total</th>'
+    yield '<th>Indent Level</th>'
+    yield '<th>Full Signature</th>'
+    yield '</tr>'
+    yield '</thead>'
+    yield '<tbody>'
+    
+    # Pick the page's IDs from the covering sort index, then read just those rows
+    cursor.execute(f'''
+        SELECT id, short_name_html, full_signature_html, total_time_fmt, self_time_fmt, percentage_fmt, indent_level
+        FROM (
+            SELECT id FROM functions
+            ORDER BY {order_by}
+            LIMIT ? OFFSET ?
+        ) AS page
+        JOIN functions USING (id)
+        ORDER BY {order_by}
+    ''', (PAGE_SIZE, page * PAGE_SIZE))
     
-    for func in functions:
-        func_id, short_name, full_signature, total_time, self_time, percentage, indent_level = func
-        
-        params = {'view': 'function', 'id': func_id, 'sort': sort_by}
-        link = f"/?{urlencode(params)}"
+    sort_query = html.escape(urlencode({'sort': sort_by}))
+    
+    # Stream rows in chunks so memory stays bounded for large profiles
+    while True:
+        functions = cursor.fetchmany(FETCH_SIZE)
+        if not functions:
+            break
         
-        output.append('<tr>')
-        output.append(f'<td><a href="{html.escape(link)}" class="function-link">{html.escape(short_name)}</a></td>')
-        output.append(f'<td class="time-cell">{format_time(total_time)}</td>')
-        output.append(f'<td class="time-cell">{format_time(self_time)}</td>')
-        output.append(f'<td class="percentage-cell">{percentage:.2f}%</td>')
-        output.append(f'<td>{indent_level}</td>')
-        output.append(f'<td class="signature-cell">{html.escape(full_signature)}</td>')
-        output.append('</tr>')
+        for func in functions:
+            func_id, short_name_html, full_signature_html, total_time_fmt, self_time_fmt, percentage_fmt, indent_level = func
+            yield ROW_TEMPLATE % (func_id, sort_query, short_name_html, total_time_fmt, self_time_fmt,
+                                  percentage_fmt, indent_level, full_signature_html)
+    
+    yield '</tbody>'
+    yield '</table>'
+    yield pagination_links(sort_by, page, page_count)
+    yield html_footer()
+
+
+def show_search_results(conn, query, sort_by):
+    """Yield the functions matching a search, hottest first, one HTML fragment at a time."""
+    cursor = conn.cursor()
+    
+    yield html_header(f"Search: {query}")
+    
+    params = {'sort': sort_by}
+    yield f'<a href="/?{urlencode(params)}" class="back-link">← Back to Function List</a>'
+    yield f"<h1>Search Results</h1>"
+    yield search_form(query, sort_by)
     
-    output.append('</tbody>')
-    output.append('</table>')
-    output.append(html_footer())
+    # A query with nothing searchable left (e.g. only control characters) matches nothing
+    match = fts_query(query)
+    functions = []
+    
+    try:
+        if match:
+            cursor.execute('''
+                SELECT f.id, f.short_name_html, f.full_signature_html, f.total_time_fmt, f.self_time_fmt, f.percentage_fmt, f.indent_level
+                FROM functions_fts
+                JOIN functions f ON f.id = functions_fts.rowid
+                WHERE functions_fts MATCH ?
+                ORDER BY f.total_time DESC
+                LIMIT ?
+            ''', (match, PAGE_SIZE))
+            functions = cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        # Databases built without FTS5 have no functions_fts table (or SQLite lacks the module)
+        if str(e).startswith(('no such table', 'no such module')):
+            yield '<div class="error">Search is not available for this database.</div>'
+        else:
+            yield f'<div class="error">Could not search for "{html.escape(query)}": {html.escape(str(e))}</div>'
+        yield html_footer()
+        return
+    
+    if not functions:
+        yield f'<p class="info">No functions match "{html.escape(query)}".</p>'
+        yield html_footer()
+        return
+    
+    limit_note = f' (showing the first {PAGE_SIZE})' if len(functions) == PAGE_SIZE else ''
+    yield f'<p class="info">Matching functions: {len(functions)}{limit_note} | Sorted by: Total Time</p>'
+    
+    yield '<table>'
+    yield '<thead>'
+    yield '<tr>'
+    yield '<th>Function</th>'
+    yield '<th class="time-cell">Total Time</th>'
+    yield '<th class="time-cell">Self Time</th>'
+    yield '<th class="percentage-cell">% of Total</th>'
+    yield '<th>Indent Level</th>'
+    yield '<th>Full Signature</th>'
+    yield '</tr>'
+    yield '</thead>'
+    yield '<tbody>'
+    
+    sort_query = html.escape(urlencode({'sort': sort_by}))
+    
+    for func in functions:
+        func_id, short_name_html, full_signature_html, total_time_fmt, self_time_fmt, percentage_fmt, indent_level = func
+        yield ROW_TEMPLATE % (func_id, sort_query, short_name_html, total_time_fmt, self_time_fmt,
+                              percentage_fmt, indent_level, full_signature_html)
     
-    return '\n'.join(output)
+    yield '</tbody>'
+    yield '</table>'
+    yield html_footer()
 
 
-def show_function_details(conn, func_id, sort_by='total'):
-    """Display function details and its immediate children."""
+def show_function_details(conn, func_id, sort_by):
+    """Yield function details and its immediate children, one HTML fragment at a time."""
     cursor = conn.cursor()
     
-    # Get function details
+    # Get function details (IDs are integer CSV line numbers; anything outside
+    # SQLite's integer range cannot match and would not bind)
+    row_id = int(func_id) if func_id.isdecimal() else None
+    if row_id is not None and row_id >= 2**63:
+        row_id = None
+    
     cursor.execute('''
         SELECT id, short_name, full_signature, total_time, self_time, percentage, indent_level
         FROM functions
         WHERE id = ?
-    ''', (func_id,))
+    ''', (row_id,))
     
     func = cursor.fetchone()
     
-    output = []
-    
     if not func:
-        output.append(html_header("Function Not Found"))
-        output.append("<h1>Function Not Found</h1>")
-        output.append(f'<div class="error">Function ID "{html.escape(func_id)}" not found in database.</div>')
+        yield html_header("Function Not Found")
+        yield "<h1>Function Not Found</h1>"
+        yield f'<div class="error">Function ID "{html.escape(func_id)}" not found in database.</div>'
         params = {'sort': sort_by}
-        output.append(f'<a href="/?{urlencode(params)}" class="back-link">← Back to Function List</a>')
-        output.append(html_footer())
-        return '\n'.join(output)
+        yield f'<a href="/?{urlencode(params)}" class="back-link">← Back to Function List</a>'
+        yield html_footer()
+        return
     
     func_id, short_name, full_signature, total_time, self_time, percentage, indent_level = func
     
-    # Get children - use cache table for faster lookups
+    # Count children (indexed on parent_id)
     cursor.execute('''
-        SELECT child_id, child_short_name, child_full_signature, 
-               child_total_time, child_self_time, child_percentage, child_indent_level
-        FROM function_children_cache
+        SELECT COUNT(*)
+        FROM functions
         WHERE parent_id = ?
-        ORDER BY child_total_time DESC
     ''', (func_id,))
     
-    children = cursor.fetchall()
+    child_count = cursor.fetchone()[0]
     
-    output.append(html_header(f"Function Details: {short_name}"))
+    yield html_header(f"Function Details: {short_name}")
     
     # Back link
     params = {'sort': sort_by}
-    output.append(f'<a href="/?{urlencode(params)}" class="back-link">← Back to Function List</a>')
+    yield f'<a href="/?{urlencode(params)}" class="back-link">← Back to Function List</a>'
     
-    output.append(f"<h1>Function Details</h1>")
+    yield f"<h1>Function Details</h1>"
     
     # Function details
-    output.append('<div class="function-details">')
-    output.append(f'<h2>{html.escape(short_name)}</h2>')
-    output.append(f'<p><strong>Total Time:</strong> {format_time(total_time)} ({percentage:.2f}% of total)</p>')
-    output.append(f'<p><strong>Self Time:</strong> {format_time(self_time)}</p>')
-    output.append(f'<p><strong>Indent Level:</strong> {indent_level}</p>')
-    output.append(f'<p class="function-signature"><strong>Signature:</strong> {html.escape(full_signature)}</p>')
-    output.append('</div>')
+    yield '<div class="function-details">'
+    yield f'<h2>{html.escape(short_name)}</h2>'
+    yield f'<p><strong>Total Time:</strong> {format_time(total_time)} ({percentage:.2f}% of total)</p>'
+    yield f'<p><strong>Self Time:</strong> {format_time(self_time)}</p>'
+    yield f'<p><strong>Indent Level:</strong> {indent_level}</p>'
+    yield f'<p class="function-signature"><strong>Signature:</strong> {html.escape(full_signature)}</p>'
+    yield '</div>'
     
     # Children table
-    if children:
-        output.append(f'<h2>Immediate Children ({len(children)})</h2>')
-        output.append('<table>')
-        output.append('<thead>')
-        output.append('<tr>')
-        output.append('<th>Function</th>')
-        output.append('<th class="time-cell">Total Time</th>')
-        output.append('<th class="time-cell">Self Time</th>')
-        output.append('<th class="percentage-cell">% of Total</th>')
-        output.append('<th>Indent Level</th>')
-        output.append('<th>Full Signature</th>')
-        output.append('</tr>')
-        output.append('</thead>')
-        output.append('<tbody>')
+    if child_count:
+        yield f'<h2>Immediate Children ({child_count})</h2>'
+        yield '<table>'
+        yield '<thead>'
+        yield '<tr>'
+        yield '<th>Function</th>'
+        yield '<th class="time-cell">Total Time</th>'
+        yield '<th class="time-cell">Self Time</th>'
+        yield '<th class="percentage-cell">% of Total</th>'
+        yield '<th>Indent Level</th>'
+        yield '<th>Full Signature</th>'
+        yield '</tr>'
+        yield '</thead>'
+        yield '<tbody>'
         
-        for child in children:
-            child_id, child_short_name, child_full_signature, child_total_time, child_self_time, child_percentage, child_indent_level = child
-            
-            params = {'view': 'function', 'id': child_id, 'sort': sort_by}
-            link = f"/?{urlencode(params)}"
+        cursor.execute('''
+            SELECT id, short_name_html, full_signature_html, 
+                   total_time_fmt, self_time_fmt, percentage_fmt, indent_level
+            FROM functions
+            WHERE parent_id = ?
+            ORDER BY total_time DESC
+        ''', (func_id,))
+        
+        sort_query = html.escape(urlencode({'sort': sort_by}))
+        
+        while True:
+            children = cursor.fetchmany(FETCH_SIZE)
+            if not children:
+                break
             
-            output.append('<tr>')
-            output.append(f'<td><a href="{html.escape(link)}" class="function-link">{html.escape(child_short_name)}</a></td>')
-            output.append(f'<td class="time-cell">{format_time(child_total_time)}</td>')
-            output.append(f'<td class="time-cell">{format_time(child_self_time)}</td>')
-            output.append(f'<td class="percentage-cell">{child_percentage:.2f}%</td>')
-            output.append(f'<td>{child_indent_level}</td>')
-            output.append(f'<td class="signature-cell">{html.escape(child_full_signature)}</td>')
-            output.append('</tr>')
+            for child in children:
+                child_id, child_short_name_html, child_full_signature_html, child_total_time_fmt, child_self_time_fmt, child_percentage_fmt, child_indent_level = child
+                yield ROW_TEMPLATE % (child_id, sort_query, child_short_name_html, child_total_time_fmt, child_self_time_fmt,
+                                      child_percentage_fmt, child_indent_level, child_full_signature_html)
         
-        output.append('</tbody>')
-        output.append('</table>')
+        yield '</tbody>'
+        yield '</table>'
     else:
-        output.append('<p class="info">This function has no children (leaf function).</p>')
-    
-    output.append(html_footer())
+        yield '<p class="info">This function has no children (leaf function).</p>'
     
-    return '\n'.join(output)
+    yield html_footer()
+
+
+class ResponseBody:
+    """Streamed response body: buffers HTML fragments, optionally gzips them,
+    and writes them as HTTP/1.1 chunks (or as-is for HTTP/1.0 clients)."""
+    
+    def __init__(self, wfile, chunked, compress):
+        self.wfile = wfile
+        self.chunked = chunked
+        self.compressor = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+        self.pending = []
+        self.pending_size = 0
+    
+    def write(self, fragment):
+        """Queue one HTML fragment, sending a chunk once enough has accumulated."""
+        data = fragment.encode('utf-8') + b'\n'
+        if self.compressor:
+            data = self.compressor.compress(data)
+        self.pending.append(data)
+        self.pending_size += len(data)
+        if self.pending_size >= CHUNK_SIZE:
+            self.flush()
+    
+    def flush(self):
+        """Send everything queued so far as one chunk."""
+        data = b''.join(self.pending)
+        self.pending.clear()
+        self.pending_size = 0
+        if not data:
+            return
+        if self.chunked:
+            self.wfile.write(b'%x\r\n' % len(data))
+            self.wfile.write(data)
+            self.wfile.write(b'\r\n')
+        else:
+            self.wfile.write(data)
+    
+    def close(self):
+        """Send the remaining data and terminate the body."""
+        if self.compressor:
+            self.pending.append(self.compressor.flush())
+        self.flush()
+        if self.chunked:
+            self.wfile.write(b'0\r\n\r\n')
 
 
 class VTuneRequestHandler(BaseHTTPRequestHandler):
     """HTTP request handler for VTune viewer."""
     
+    # HTTP/1.1 for chunked transfer encoding (and keep-alive)
+    protocol_version = 'HTTP/1.1'
+    
+    # Buffer wfile so chunks are not split across syscalls
+    wbufsize = 64 * 1024
+    
     def do_GET(self):
         """Handle GET requests."""
+        body = None
         try:
             # Parse URL
             parsed_url = urlparse(self.path)
@@ -413,35 +620,67 @@ class VTuneRequestHandler(BaseHTTPRequestHandler):
             view = query_params.get('view', ['list'])[0]
             func_id = query_params.get('id', [''])[0]
             sort_by = query_params.get('sort', ['total'])[0]
+            page = query_params.get('page', ['0'])[0]
+            page = int(page) if page.isdecimal() else 0
+            query = query_params.get('q', [''])[0].strip()
             
-            # Connect to database
-            conn = sqlite3.connect(DB_PATH)
+            # Borrow an idle connection (warm page and statement caches), or open one
+            try:
+                conn = CONNECTION_POOL.get_nowait()
+            except queue.Empty:
+                conn = open_connection()
+            
+            # Send headers up front and stream the page as it is generated
+            chunked = self.request_version == 'HTTP/1.1'
+            body = ResponseBody(self.wfile, chunked, 'gzip' in self.headers.get('Accept-Encoding', ''))
+            
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            if body.compressor:
+                self.send_header('Content-Encoding', 'gzip')
+            if chunked:
+                self.send_header('Transfer-Encoding', 'chunked')
+            else:
+                # HTTP/1.0 clients see the end of the body when the connection closes
+                self.close_connection = True
+            self.end_headers()
             
             # Generate response
             if view == 'function' and func_id:
-                html_content = show_function_details(conn, func_id, sort_by)
+                fragments = show_function_details(conn, func_id, sort_by)
+            elif query:
+                fragments = show_search_results(conn, query, sort_by)
             else:
-                html_content = show_function_list(conn, sort_by)
+                fragments = show_function_list(conn, sort_by, page)
             
-            conn.close()
+            try:
+                for fragment in fragments:
+                    body.write(fragment)
+            finally:
+                # Finish the generator (and its cursor) before another thread can borrow the connection
+                fragments.close()
+                CONNECTION_POOL.put(conn)
             
-            # Send response
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/html; charset=utf-8')
-            self.end_headers()
-            self.wfile.write(html_content.encode('utf-8'))
+            body.close()
             
         except Exception as e:
             # Error response
-            error_html = html_header("Error")
-            error_html += '<h1>Error</h1>'
+            error_html = '<h1>Error</h1>'
             error_html += f'<div class="error"><pre>{html.escape(str(e))}</pre></div>'
             error_html += html_footer()
             
+            if body:
+                # Headers are already out; finish the page with the error instead
+                body.write(error_html)
+                body.close()
+                return
+            
+            error_body = (html_header("Error") + error_html).encode('utf-8')
             self.send_response(500)
             self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(error_body)))
             self.end_headers()
-            self.wfile.write(error_html.encode('utf-8'))
+            self.wfile.write(error_body)
     
     def log_message(self, format, *args):
         """Override to customize log messages."""
@@ -474,9 +713,12 @@ def main():
     
     DB_PATH = os.path.abspath(db_file)
     
-    # Start server
+    # Open the first connection up front; requests borrow and return pooled connections
+    CONNECTION_POOL.put(open_connection())
+    
+    # Start server (one thread per request)
     server_address = ('', port)
-    httpd = HTTPServer(server_address, VTuneRequestHandler)
+    httpd = ThreadingHTTPServer(server_address, VTuneRequestHandler)
     
     print(f"VTune Profiling Data Viewer")
     print(f"=" * 50)
@@ -490,6 +732,8 @@ def main():
     except KeyboardInterrupt:
         print("\n\nShutting down server...")
         httpd.shutdown()
+        while not CONNECTION_POOL.empty():
+            CONNECTION_POOL.get_nowait().close()
         print("Server stopped.")
 
 